@@ -1,14 +1,40 @@
-from typing import Any, Optional, Tuple
+import os
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import torch
-from compressed_tensors.quantization.quant_args import QuantizationArgs
-from compressed_tensors.quantization.utils import calculate_qparams
+from compressed_tensors.quantization.quant_args import (
+    FP4_E2M1_DATA,
+    FP8_E4M3_DATA,
+    QuantizationArgs,
+)
+from compressed_tensors.quantization.utils import calculate_range, is_fp4
 from compressed_tensors.utils import deprecated
+from loguru import logger
 
 from llmcompressor.observers.base import Observer
 
 __all__ = ["MinMaxObserver", "MovingAverageMinMaxObserver"]
 
+# number of consecutive calls with the same input shape before the compiled observer
+# step is used for that shape
+_STABLE_STEPS_BEFORE_COMPILE = 8
+
+# torch.compile is not otherwise supported by llmcompressor, so compiling the
+# observer update on gpu is opt in
+_COMPILE_OBSERVERS = bool(int(os.environ.get("LLM_COMPRESSOR_COMPILE_OBSERVERS", "0")))
+
 
 @Observer.register("minmax")
 class MinMaxObserver(Observer):
@@ -25,10 +51,39 @@ class MinMaxObserver(Observer):
     ):
         super().__init__(quantization_args=quantization_args)
 
-        self.min_val = {}
-        self.max_val = {}
+        # running min and max values are stacked along dim 0, one row per tensor_id.
+        # Buffers are not persistent so that observer state, which is only needed
+        # during calibration, is excluded from the state dict of observed modules
+        self.register_buffer("running_min", torch.empty(0), persistent=False)
+        self.register_buffer("running_max", torch.empty(0), persistent=False)
+        self._id_to_idx: Dict[Any, int] = {}
         self.averaging_constant = averaging_constant
 
+        # resolve the quantization args into constants once, rather than per call
+        (
+            self._qmin,
+            self._qmax,
+            self._symmetric,
+            self._dtype,
+            self._is_fp4,
+        ) = _resolve_qparams(quantization_args)
+
+        # (min_val, max_val, global_scale, scale, zero_point) of the last qparams
+        # calculated for each tensor_id when averaging is disabled. global_scale is
+        # cloned since it is typically a module parameter which is updated in place.
+        # With averaging, the running values almost always change, so the cache is
+        # not used to avoid a device sync per call
+        self._qparams_cache: Dict[Any, Tuple[torch.Tensor, ...]] = {}
+
+        # (shape, dtype, device, reduce_dims) keys of observed tensors for which the
+        # compiled observer step is used. A key is only added once it has been
+        # observed for several consecutive calls, so that inputs with varying shapes,
+        # such as activations, do not trigger compilation
+        self._stable_step_keys: Set[Tuple] = set()
+        self._step_key: Optional[Tuple] = None
+        self._step_count = 0
+
+    @torch.no_grad()
     def calculate_qparams(
         self,
         observed: torch.Tensor,
@@ -50,57 +105,194 @@ class MinMaxObserver(Observer):
         :return: tuple of scale and zero point derived from the observed tensor
         """
         tensor_id = tensor_id or "default"
+        index = self._id_to_idx.get(tensor_id, None)
+
+        # once the input shape is stable, optionally run the whole steady state update
+        # as compiled kernels rather than dispatching each op from python
+        if (
+            index is not None
+            and self.averaging_constant != 1.0
+            and _compile_enabled(observed.device)
+            and self._is_stable_step(observed, reduce_dims)
+        ):
+            scale, zero_point, updated_min_val, updated_max_val = _call_compiled(
+                _get_compiled_observer_step,
+                _observer_step,
+                observed,
+                reduce_dims,
+                self.running_min[index],
+                self.running_max[index],
+                self.averaging_constant,
+                self._qmin,
+                self._qmax,
+                self._symmetric,
+                self._dtype,
+                self._is_fp4,
+                global_scale,
+            )
+            self.running_min[index] = updated_min_val
+            self.running_max[index] = updated_max_val
+            return scale, zero_point
+
+        min_val, max_val = _aminmax(observed, reduce_dims)
+        return self._update_and_calculate_qparams(
+            min_val, max_val, tensor_id=tensor_id, global_scale=global_scale
+        )
 
+    @classmethod
+    @torch.no_grad()
+    def calibrate_batch(
+        cls,
+        observers: List["MinMaxObserver"],
+        tensors: List[torch.Tensor],
+        dim: int,
+        tensor_id: Optional[Any] = None,
+        global_scales: Optional[List[Optional[torch.Tensor]]] = None,
+    ) -> List[Tuple[torch.FloatTensor, torch.IntTensor]]:
+        """
+        Calculate quantization parameters along the specified dimension for
+        many like-shaped tensors at once, such as the weights of several layers.
+        The tensors are stacked so that their min and max values are computed by a
+        single reduction, then each observer is updated with its own values. Like
+        calling each observer, the observed tokens and latest scale and zero point
+        of each observer are recorded
+
+        :param observers: observers to update, one per tensor
+        :param tensors: like-shaped tensors to calculate quantization parameters for
+        :param dim: dimension to calculate quantization parameters along
+        :param tensor_id: Optional id if different ranges of observed tensors are
+            passed, useful for sharding tensors by group_size
+        :param global_scales: optional scales to further scale local quantization
+            scales, one per tensor
+        :return: list of scale and zero point tuples, one per tensor
+        """
+        if len(observers) != len(tensors):
+            raise ValueError(
+                f"Expected one tensor per observer, got {len(observers)} observers "
+                f"and {len(tensors)} tensors"
+            )
+        if not tensors:
+            raise ValueError("Batched calibration requires at least one tensor")
+        if global_scales is None:
+            global_scales = [None] * len(tensors)
+
+        ndim = tensors[0].ndim
+        if not -ndim <= dim < ndim:
+            raise ValueError(f"dim {dim} is out of range for {ndim}D tensors")
+
+        # offset the reduced dims past the new leading stack dimension
+        reduce_dims = tuple(idx + 1 for idx in _reduce_dims_except(ndim, dim % ndim))
         if not reduce_dims:
-            min_val, max_val = torch.aminmax(observed)
-        else:
-            min_val = torch.amin(observed, dim=reduce_dims, keepdims=True)
-            max_val = torch.amax(observed, dim=reduce_dims, keepdims=True)
+            raise ValueError("Batched calibration requires at least 2D tensors")
+
+        stacked = torch.stack(tensors)
+        min_vals, max_vals = _aminmax(stacked, reduce_dims)
+
+        qparams = []
+        for observer, tensor, min_val, max_val, global_scale in zip(
+            observers, tensors, min_vals, max_vals, global_scales
+        ):
+            observer.record_observed_tokens(tensor)
+            observer._scale, observer._zero_point = (
+                observer._update_and_calculate_qparams(
+                    min_val, max_val, tensor_id=tensor_id, global_scale=global_scale
+                )
+            )
+            qparams.append((observer._scale, observer._zero_point))
+
+        return qparams
+
+    def _update_and_calculate_qparams(
+        self,
+        min_val: torch.Tensor,
+        max_val: torch.Tensor,
+        tensor_id: Optional[Any] = None,
+        global_scale: Optional[torch.Tensor] = None,
+    ) -> Tuple[torch.FloatTensor, torch.IntTensor]:
+        """
+        Update the running min and max of the tensor_id with newly observed values
+        and calculate the resulting scale and zero point
+
+        :param min_val: newly observed min values
+        :param max_val: newly observed max values
+        :param tensor_id: Optional id if different ranges of observed tensors are
+            passed, useful for sharding tensors by group_size
+        :param global_scale: optional scale to further scale local quantization scales
+        :return: tuple of scale and zero point derived from the observed values
+        """
+        tensor_id = tensor_id or "default"
 
         # early stopping, save some computation and memory
         if self.averaging_constant == 1.0:
-            return calculate_qparams(
-                min_vals=min_val,
-                max_vals=max_val,
-                quantization_args=self.quantization_args,
-                global_scale=global_scale,
+            return self._calculate_qparams_cached(
+                tensor_id, min_val, max_val, global_scale
             )
 
-        running_min_val = self.min_val.get(tensor_id, None)
-        running_max_val = self.max_val.get(tensor_id, None)
+        index = self._id_to_idx.get(tensor_id, None)
 
-        if running_min_val is None or running_max_val is None:
-            updated_min_val = min_val
-            updated_max_val = max_val
-        else:
-            updated_min_val = running_min_val + self.averaging_constant * (
-                min_val - running_min_val
+        if index is None:
+            self._add_running_min_max(tensor_id, min_val, max_val)
+
+            return _calculate_qparams_fast(
+                min_val,
+                max_val,
+                self._qmin,
+                self._qmax,
+                self._symmetric,
+                self._dtype,
+                self._is_fp4,
+                global_scale,
             )
-            updated_max_val = running_max_val + self.averaging_constant * (
-                max_val - running_max_val
+
+        update_args = (
+            min_val,
+            max_val,
+            self.running_min[index],
+            self.running_max[index],
+            self.averaging_constant,
+            self._qmin,
+            self._qmax,
+            self._symmetric,
+            self._dtype,
+            self._is_fp4,
+            global_scale,
+        )
+
+        # optionally fuse the moving average update and qparam math into compiled
+        # kernels when running on gpu, where per-op launch overhead dominates
+        if _compile_enabled(min_val.device):
+            scale, zero_point, updated_min_val, updated_max_val = _call_compiled(
+                _get_compiled_minmax_update_and_qparams,
+                _minmax_update_and_qparams,
+                *update_args,
+            )
+        else:
+            scale, zero_point, updated_min_val, updated_max_val = (
+                _minmax_update_and_qparams(*update_args)
             )
 
-        self.min_val[tensor_id] = updated_min_val
-        self.max_val[tensor_id] = updated_max_val
+        self.running_min[index] = updated_min_val
+        self.running_max[index] = updated_max_val
 
-        return calculate_qparams(
-            min_vals=updated_min_val,
-            max_vals=updated_max_val,
-            quantization_args=self.quantization_args,
-            global_scale=global_scale,
-        )
+        return scale, zero_point
 
     def get_qparams_along_dim(
         self,
         observed: torch.Tensor,
-        dim: int,
+        dim: Union[int, Iterable[int]],
         tensor_id: Optional[Any] = None,
         global_scale: Optional[torch.Tensor] = None,
     ):
         """
         Calculate quantization parameters along the specified dimension
         """
-        reduce_dims = tuple(idx for idx in range(observed.ndim) if idx != dim)
+        # sets of dims, as passed for token-wise quantization, are not hashable. As
+        # before reduce dims were cached, they never equal a single index, so all
+        # dims are reduced
+        if not isinstance(dim, int):
+            dim = frozenset(dim)
+
+        reduce_dims = _reduce_dims_except(observed.ndim, dim)
         return self.calculate_qparams(
             observed,
             reduce_dims=reduce_dims,
@@ -113,8 +305,507 @@ class MinMaxObserver(Observer):
         Reset the state of the observer, including min and maximum values
         """
         super().reset()
-        self.min_val = {}
-        self.max_val = {}
+        self._id_to_idx = {}
+        self._qparams_cache = {}
+
+        self.running_min.zero_()
+        self.running_max.zero_()
+
+    def _is_stable_step(
+        self,
+        observed: torch.Tensor,
+        reduce_dims: Optional[Tuple[int, ...]] = None,
+    ) -> bool:
+        """
+        :param observed: observed tensor to calculate quantization parameters for
+        :param reduce_dims: optional tuple of dimensions to reduce along
+        :return: True if the shape of the observed tensor has been stable for enough
+            consecutive calls to use the compiled observer step
+        """
+        key = (tuple(observed.shape), observed.dtype, observed.device, reduce_dims)
+        if key in self._stable_step_keys:
+            return True
+
+        if key != self._step_key:
+            self._step_key = key
+            self._step_count = 0
+        self._step_count += 1
+        if self._step_count < _STABLE_STEPS_BEFORE_COMPILE:
+            return False
+
+        self._stable_step_keys.add(key)
+        return True
+
+    def _get_cached_qparams(
+        self,
+        tensor_id: Any,
+        min_val: torch.Tensor,
+        max_val: torch.Tensor,
+        global_scale: Optional[torch.Tensor] = None,
+    ) -> Optional[Tuple[torch.FloatTensor, torch.IntTensor]]:
+        """
+        :param tensor_id: id of the observed tensor
+        :param min_val: min values to calculate qparams from
+        :param max_val: max values to calculate qparams from
+        :param global_scale: optional scale to further scale local quantization scales
+        :return: the scale and zero point last calculated for the tensor_id if they
+            were calculated from the same values, otherwise None
+        """
+        cached = self._qparams_cache.get(tensor_id, None)
+        if cached is None:
+            return None
+
+        prev_min, prev_max, prev_global_scale, scale, zero_point = cached
+        if (
+            torch.equal(min_val, prev_min)
+            and torch.equal(max_val, prev_max)
+            and _optional_equal(global_scale, prev_global_scale)
+        ):
+            return scale, zero_point
+
+        return None
+
+    def _calculate_qparams_cached(
+        self,
+        tensor_id: Any,
+        min_val: torch.Tensor,
+        max_val: torch.Tensor,
+        global_scale: Optional[torch.Tensor] = None,
+    ) -> Tuple[torch.FloatTensor, torch.IntTensor]:
+        """
+        Calculate the scale and zero point from min and max values, reusing the
+        last calculated qparams of the tensor_id if the values have not changed
+
+        :param tensor_id: id of the observed tensor
+        :param min_val: min values to calculate qparams from
+        :param max_val: max values to calculate qparams from
+        :param global_scale: optional scale to further scale local quantization scales
+        :return: tuple of scale and zero point
+        """
+        cached_qparams = self._get_cached_qparams(
+            tensor_id, min_val, max_val, global_scale
+        )
+        if cached_qparams is not None:
+            return cached_qparams
+
+        scale, zero_point = _calculate_qparams_fast(
+            min_val,
+            max_val,
+            self._qmin,
+            self._qmax,
+            self._symmetric,
+            self._dtype,
+            self._is_fp4,
+            global_scale,
+        )
+        self._qparams_cache[tensor_id] = (
+            min_val,
+            max_val,
+            _optional_clone(global_scale),
+            scale,
+            zero_point,
+        )
+
+        return scale, zero_point
+
+    def _add_running_min_max(
+        self, tensor_id: Any, min_val: torch.Tensor, max_val: torch.Tensor
+    ):
+        """
+        Assign a row of the running min and max buffers to a new tensor_id. Rows
+        left over from before a reset are reused, otherwise the buffers are grown
+
+        :param tensor_id: id of the newly observed tensor
+        :param min_val: initial min values for the tensor_id
+        :param max_val: initial max values for the tensor_id
+        """
+        index = len(self._id_to_idx)
+        self._id_to_idx[tensor_id] = index
+
+        # moving averages of integer tensors are fractional
+        if not min_val.is_floating_point():
+            min_val = min_val.to(torch.get_default_dtype())
+            max_val = max_val.to(torch.get_default_dtype())
+
+        if index == 0 and (
+            self.running_min.shape[1:] != min_val.shape
+            or self.running_min.dtype != min_val.dtype
+            or self.running_min.device != min_val.device
+        ):
+            self.running_min = min_val.unsqueeze(0).clone()
+            self.running_max = max_val.unsqueeze(0).clone()
+        elif index < self.running_min.shape[0]:
+            self.running_min[index] = min_val
+            self.running_max[index] = max_val
+        else:
+            self.running_min = torch.cat([self.running_min, min_val.unsqueeze(0)])
+            self.running_max = torch.cat([self.running_max, max_val.unsqueeze(0)])
+
+
+def _minmax_update_and_qparams(
+    min_val: torch.Tensor,
+    max_val: torch.Tensor,
+    running_min_val: torch.Tensor,
+    running_max_val: torch.Tensor,
+    averaging_constant: float,
+    qmin: float,
+    qmax: float,
+    symmetric: bool,
+    dtype: torch.dtype,
+    is_fp4: bool,
+    global_scale: Optional[torch.Tensor] = None,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Calculate the updated running min and max values using a moving average and
+    the resulting scale and zero point. The running values are not modified
+
+    :param min_val: newly observed min values
+    :param max_val: newly observed max values
+    :param running_min_val: running min values
+    :param running_max_val: running max values
+    :param averaging_constant: weight given to the newly observed values
+    :param qmin: min value of the quantized range
+    :param qmax: max value of the quantized range
+    :param symmetric: whether quantization is symmetric
+    :param dtype: dtype of the zero point
+    :param is_fp4: whether quantization is to fp4
+    :param global_scale: optional scale to further scale local quantization scales
+    :return: tuple of scale, zero point, updated min values and updated max values
+    """
+    # the running values are not modified, so that a call which fails part way can
+    # safely be repeated
+    updated_min_val = torch.lerp(
+        running_min_val, min_val.to(running_min_val.dtype), averaging_constant
+    )
+    updated_max_val = torch.lerp(
+        running_max_val, max_val.to(running_max_val.dtype), averaging_constant
+    )
+
+    scale, zero_point = _calculate_qparams_fast(
+        updated_min_val,
+        updated_max_val,
+        qmin,
+        qmax,
+        symmetric,
+        dtype,
+        is_fp4,
+        global_scale,
+    )
+
+    return scale, zero_point, updated_min_val, updated_max_val
+
+
+def _observer_step(
+    observed: torch.Tensor,
+    reduce_dims: Optional[Tuple[int, ...]],
+    running_min_val: torch.Tensor,
+    running_max_val: torch.Tensor,
+    averaging_constant: float,
+    qmin: float,
+    qmax: float,
+    symmetric: bool,
+    dtype: torch.dtype,
+    is_fp4: bool,
+    global_scale: Optional[torch.Tensor] = None,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Reduce the observed tensor to its min and max values, then calculate the
+    updated running min and max values and the resulting scale and zero point.
+    See `_minmax_update_and_qparams` for the remaining params
+
+    :param observed: observed tensor to calculate quantization parameters for
+    :param reduce_dims: optional tuple of dimensions to reduce along
+    :return: tuple of scale, zero point, updated min values and updated max values
+    """
+    min_val, max_val = _aminmax(observed, reduce_dims)
+    return _minmax_update_and_qparams(
+        min_val,
+        max_val,
+        running_min_val,
+        running_max_val,
+        averaging_constant,
+        qmin,
+        qmax,
+        symmetric,
+        dtype,
+        is_fp4,
+        global_scale,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_compiled_observer_step() -> Callable:
+    """
+    Lazily compile `_observer_step`. The compiled function is shared by all
+    observers, since dynamo caches compiled graphs per function. Shapes are
+    dynamic so that the many weight shapes of a model do not each use up one of
+    dynamo's recompiles, and graph breaks fall back to eager rather than raising
+    """
+    return torch.compile(_observer_step, dynamic=True)
+
+
+@lru_cache(maxsize=None)
+def _get_compiled_minmax_update_and_qparams() -> Callable:
+    """
+    Lazily compile `_minmax_update_and_qparams` so that compilation only happens
+    once the compiled path is actually used. cudagraphs ("reduce-overhead") are not
+    used, since the updated min/max values are stored as running state which
+    outlives each graph replay
+    """
+    return torch.compile(_minmax_update_and_qparams, dynamic=True)
+
+
+def _compile_enabled(device: torch.device) -> bool:
+    """
+    :param device: device of the observed values
+    :return: True if the observer update should be compiled for the device
+    """
+    return _COMPILE_OBSERVERS and device.type == "cuda" and hasattr(torch, "compile")
+
+
+def _call_compiled(
+    get_compiled_fn: Callable[[], Callable], eager_fn: Callable, *args
+) -> Any:
+    """
+    Call a compiled function, falling back to its eager version if compilation
+    fails. After a failure, compilation is disabled for the rest of the process
+
+    :param get_compiled_fn: function returning the compiled function
+    :param eager_fn: eager version of the compiled function
+    :param args: arguments to call the function with
+    :return: result of the function call
+    """
+    # torch.compile raises a RuntimeError when compilation is unsupported, such as
+    # on python versions newer than the installed torch supports
+    try:
+        compiled_fn = get_compiled_fn()
+    except RuntimeError as err:
+        _disable_compile(eager_fn, err)
+        return eager_fn(*args)
+
+    # only errors raised while tracing or compiling fall back to eager execution,
+    # which is safe since the function does not modify its arguments
+    try:
+        return compiled_fn(*args)
+    except _get_compile_errors() as err:
+        _disable_compile(eager_fn, err)
+        return eager_fn(*args)
+
+
+def _disable_compile(eager_fn: Callable, err: Exception):
+    """
+    Disable compilation of the observer update for the rest of the process
+
+    :param eager_fn: eager version of the function which failed to compile
+    :param err: error raised by the failed compilation
+    """
+    global _COMPILE_OBSERVERS
+
+    logger.warning(
+        f"Failed to compile {eager_fn.__name__}, falling back to eager execution: "
+        f"{err}"
+    )
+    _COMPILE_OBSERVERS = False
+
+
+@lru_cache(maxsize=None)
+def _get_compile_errors() -> Tuple[type, ...]:
+    """
+    :return: exception types raised when torch.compile fails to trace or compile a
+        function, as opposed to errors raised by the function itself
+    """
+    try:
+        from torch._dynamo.exc import TorchDynamoException
+    except ImportError:
+        return ()
+
+    return (TorchDynamoException,)
+
+
+def _resolve_qparams(
+    quantization_args: QuantizationArgs,
+) -> Tuple[float, float, bool, torch.dtype, bool]:
+    """
+    Resolve the constants needed to calculate qparams from quantization args
+
+    :param quantization_args: quantization args to resolve
+    :return: tuple of the min and max of the quantized range, whether quantization
+        is symmetric, the zero point dtype and whether quantization is to fp4
+    """
+    qmin, qmax = calculate_range(quantization_args, device="cpu")
+    quantization_is_fp4 = is_fp4(quantization_args=quantization_args)
+    if quantization_is_fp4:
+        dtype = FP8_E4M3_DATA.dtype
+    else:
+        dtype = quantization_args.pytorch_dtype()
+
+    return (
+        qmin.item(),
+        qmax.item(),
+        quantization_args.symmetric,
+        dtype,
+        quantization_is_fp4,
+    )
+
+
+def _calculate_qparams_fast(
+    min_vals: torch.Tensor,
+    max_vals: torch.Tensor,
+    qmin: float,
+    qmax: float,
+    symmetric: bool,
+    dtype: torch.dtype,
+    is_fp4: bool,
+    global_scale: Optional[torch.Tensor] = None,
+) -> Tuple[torch.FloatTensor, torch.IntTensor]:
+    """
+    Equivalent of `compressed_tensors.quantization.utils.calculate_qparams` which
+    takes constants resolved by `_resolve_qparams` in place of quantization args
+
+    :param min_vals: tensor of min value(s) to calculate scale(s) and zero point(s)
+        from
+    :param max_vals: tensor of max value(s) to calculate scale(s) and zero point(s)
+        from
+    :param qmin: min value of the quantized range
+    :param qmax: max value of the quantized range
+    :param symmetric: whether quantization is symmetric
+    :param dtype: dtype of the zero point
+    :param is_fp4: whether quantization is to fp4
+    :param global_scale: optional scale to further scale local quantization scales
+    :return: tuple of the calculated scale(s) and zero point(s)
+    """
+    # 0.0 must always be representable within the quantized range
+    min_vals = torch.clamp(min_vals, max=0)
+    max_vals = torch.clamp(max_vals, min=0)
+    bit_range = qmax - qmin
+
+    if symmetric:
+        max_val_pos = torch.max(torch.abs(min_vals), torch.abs(max_vals))
+
+        if is_fp4 and global_scale is not None:
+            scales = global_scale * (max_val_pos / FP4_E2M1_DATA.max)
+            scales = torch.clamp(scales, max=FP8_E4M3_DATA.max, min=FP8_E4M3_DATA.min)
+            scales = scales.to(FP8_E4M3_DATA.dtype)
+        else:
+            scales = max_val_pos / (bit_range / 2)
+
+        if scales.dtype == FP8_E4M3_DATA.dtype:
+            # torch.clamp not supported for FP8
+            # use the next largest fp8 value from 0
+            scales = torch.where(
+                scales == 0,
+                torch.tensor(0.125, dtype=FP8_E4M3_DATA.dtype, device=scales.device),
+                scales,
+            )
+        else:
+            scales = torch.clamp(scales, min=torch.finfo(torch.float32).eps)
+
+        zero_points = torch.zeros(
+            scales.shape, device=scales.device, dtype=min_vals.dtype
+        )
+    else:
+        if is_fp4:
+            raise NotImplementedError(
+                "Asymmetric Quantization is not supported for FP4"
+            )
+
+        scales = (max_vals - min_vals) / bit_range
+        scales = torch.clamp(scales, min=torch.finfo(torch.float32).eps)
+        zero_points = qmin - (min_vals / scales)
+        zero_points = torch.clamp(zero_points, qmin, qmax)
+
+    # match zero-points to quantized type
+    # if casting to int, use round instead of truncate
+    if not dtype.is_floating_point:
+        zero_points = torch.round(zero_points)
+    zero_points = zero_points.to(dtype)
+
+    if scales.ndim == 0:
+        scales = scales.reshape(1)
+        zero_points = zero_points.reshape(1)
+
+    return scales, zero_points
+
+
+def _optional_equal(
+    tensor: Optional[torch.Tensor], other: Optional[torch.Tensor]
+) -> bool:
+    """
+    :return: True if both tensors are None or both have the same values
+    """
+    if tensor is None or other is None:
+        return tensor is other
+
+    return torch.equal(tensor, other)
+
+
+def _optional_clone(tensor: Optional[torch.Tensor]) -> Optional[torch.Tensor]:
+    """
+    :return: a clone of the tensor, or None if the tensor is None
+    """
+    return tensor.clone() if tensor is not None else None
+
+
+@lru_cache(maxsize=32)
+def _reduce_dims_except(ndim: int, dim: Union[int, FrozenSet[int]]) -> Tuple[int, ...]:
+    """
+    :param ndim: number of dimensions of the observed tensor
+    :param dim: dimension to keep
+    :return: tuple of all dimensions except for dim
+    """
+    return tuple(idx for idx in range(ndim) if idx != dim)
+
+
+def _aminmax(
+    observed: torch.Tensor, reduce_dims: Optional[Tuple[int]] = None
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Compute the min and max of the observed tensor. On gpu, a single
+    `torch.aminmax` reduction is used in place of separate amin/amax reductions
+    when the reduced dims can be viewed as one dim without a copy. On cpu, separate
+    amin/amax reductions are several times faster than `torch.aminmax`
+
+    :param observed: tensor to reduce
+    :param reduce_dims: optional tuple of dimensions to reduce along, reduced
+        dimensions are kept with size 1. If None, reduce over the whole tensor
+    :return: tuple of min and max values of the observed tensor
+    """
+    if not reduce_dims:
+        return torch.aminmax(observed)
+
+    if observed.device.type != "cuda":
+        return _amin_amax(observed, reduce_dims)
+
+    if len(reduce_dims) == 1:
+        return torch.aminmax(observed, dim=reduce_dims[0], keepdim=True)
+
+    reduce_dims = sorted(dim % observed.ndim for dim in reduce_dims)
+    keep_dims = [dim for dim in range(observed.ndim) if dim not in reduce_dims]
+    # only trailing reduced dims of a contiguous tensor can be flattened as a view
+    num_keep_dims = len(keep_dims)
+    if keep_dims != list(range(num_keep_dims)) or not observed.is_contiguous():
+        return _amin_amax(observed, tuple(reduce_dims))
+
+    output_shape = [
+        1 if dim in reduce_dims else size for dim, size in enumerate(observed.shape)
+    ]
+    min_val, max_val = torch.aminmax(observed.flatten(num_keep_dims), dim=-1)
+
+    return min_val.reshape(output_shape), max_val.reshape(output_shape)
+
+
+def _amin_amax(
+    observed: torch.Tensor, reduce_dims: Tuple[int, ...]
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    :param observed: tensor to reduce
+    :param reduce_dims: tuple of dimensions to reduce along, reduced dimensions are
+        kept with size 1
+    :return: tuple of min and max values of the observed tensor
+    """
+    min_val = torch.amin(observed, dim=reduce_dims, keepdim=True)
+    max_val = torch.amax(observed, dim=reduce_dims, keepdim=True)
+    return min_val, max_val
 
 
 class MovingAverageMinMaxObserver(MinMaxObserver):
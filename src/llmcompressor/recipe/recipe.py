@@ -1,6 +1,8 @@
 import json
 import os
 import re
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Dict, List, Optional, Union
 
 import yaml
@@ -12,6 +14,19 @@ from llmcompressor.recipe.base import RecipeBase
 from llmcompressor.recipe.modifier import RecipeModifier
 from llmcompressor.recipe.stage import RecipeStage
 
+try:
+    # use the libyaml backed loader and dumper when available
+    from yaml import CDumper as Dumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import Dumper, SafeLoader
+
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as _orjson_loads
+except ImportError:
+    _orjson_loads = None
+
 __all__ = [
     "Recipe",
     "RecipeInput",
@@ -19,6 +34,11 @@ __all__ = [
     "RecipeArgsInput",
 ]
 
+# extract YAML front matter from markdown recipe card
+# adapted from
+# https://github.com/jonbeebe/frontmatter/blob/master/frontmatter
+_FRONT_MATTER_RE = re.compile(r"^\s*(?:---|\+\+\+)(.*?)(?:---|\+\+\+)", re.S | re.M)
+
 
 class Recipe(RecipeBase):
     """
@@ -61,18 +81,10 @@ class Recipe(RecipeBase):
         if isinstance(modifiers, Modifier):
             modifiers = [modifiers]
 
-        if any(not isinstance(modifier, Modifier) for modifier in modifiers):
-            raise ValueError("modifiers must be a list of Modifier instances")
-
         group_name = modifier_group_name or "default"
 
         recipe_modifiers: List[RecipeModifier] = [
-            RecipeModifier(
-                type=modifier.__class__.__name__,
-                group=group_name,
-                args=modifier.model_dump(exclude_unset=True),
-            )
-            for modifier in modifiers
+            _build_recipe_modifier(modifier, group_name) for modifier in modifiers
         ]
         # assume one stage for modifier instances
         stages: List[RecipeStage] = [
@@ -126,7 +138,9 @@ class Recipe(RecipeBase):
                 modifiers=path_or_modifiers, modifier_group_name=modifier_group_name
             )
 
-        if not os.path.isfile(path_or_modifiers):
+        if _is_recipe_string(path_or_modifiers) or not os.path.isfile(
+            path_or_modifiers
+        ):
             # not a local file
             # assume it's a string
             logger.debug(
@@ -134,23 +148,23 @@ class Recipe(RecipeBase):
                 "attempting to process as a string."
             )
             logger.debug(f"Input string: {path_or_modifiers}")
-            obj = _load_json_or_yaml_string(path_or_modifiers)
-            return Recipe.model_validate(obj)
+            # copy so that callers which modify the recipe do not modify the cache
+            return _load_recipe_from_string(path_or_modifiers).model_copy(deep=True)
         else:
             logger.info(f"Loading recipe from file {path_or_modifiers}")
 
+        file_extension = os.path.splitext(path_or_modifiers)[1].lower()
         with open(path_or_modifiers, "r") as file:
-            content = file.read().strip()
-            if path_or_modifiers.lower().endswith(".md"):
-                content = _parse_recipe_from_md(path_or_modifiers, content)
-
-            if path_or_modifiers.lower().endswith(".json"):
-                obj = json.loads(content)
-            elif path_or_modifiers.lower().endswith(
-                ".yaml"
-            ) or path_or_modifiers.lower().endswith(".yml"):
-                obj = yaml.safe_load(content)
+            if file_extension == ".json":
+                obj = _json_loads(file.read())
+            elif file_extension in (".yaml", ".yml"):
+                # parse directly from the file stream
+                obj = yaml.load(file, Loader=SafeLoader)
             else:
+                content = file.read().strip()
+                if file_extension == ".md":
+                    content = _parse_recipe_from_md(path_or_modifiers, content)
+
                 try:
                     obj = _load_json_or_yaml_string(content)
                 except ValueError:
@@ -209,14 +223,19 @@ class Recipe(RecipeBase):
         :param recipes: The list of Recipe instances to combine
         :return: The combined Recipe instance
         """
+        if len(recipes) == 1:
+            return Recipe.simplify_recipe(recipe=recipes[0])
+
+        simplified_recipes = [
+            Recipe.simplify_recipe(recipe=recipe) for recipe in recipes
+        ]
 
         combined = Recipe()
-        for recipe in recipes:
-            simplified = Recipe.simplify_recipe(
-                recipe=recipe,
-            )
+        combined.stages = list(
+            chain.from_iterable(simplified.stages for simplified in simplified_recipes)
+        )
+        for simplified in simplified_recipes:
             combined.version = simplified.version
-            combined.stages.extend(simplified.stages)
             combined.args.update(simplified.args)
 
         return combined
@@ -334,6 +353,7 @@ class Recipe(RecipeBase):
         """
 
         stages = []
+        suffixed_stages = []
         remove_keys = []
 
         default_modifiers = RecipeStage.extract_dict_modifiers(values)
@@ -341,22 +361,26 @@ class Recipe(RecipeBase):
             default_stage = {"modifiers": default_modifiers, "group": "default"}
             stages.append(default_stage)
 
-        if "stages" in values and values["stages"]:
-            assert isinstance(
-                values["stages"], dict
-            ), f"stages must be a dict, given {values['stages']}"
-            remove_keys.append("stages")
+        # single pass over the values, stages nested under "stages" are ordered
+        # before stages given as top level "*_stage" keys
+        for key, value in values.items():
+            if key == "stages" and value:
+                assert isinstance(value, dict), f"stages must be a dict, given {value}"
+                remove_keys.append(key)
 
-            for key, value in values["stages"].items():
-                assert isinstance(value, dict), f"stage must be a dict, given {value}"
-                value["group"] = key
-                stages.append(value)
+                for stage_key, stage in value.items():
+                    assert isinstance(
+                        stage, dict
+                    ), f"stage must be a dict, given {stage}"
+                    stage["group"] = stage_key
+                    stages.append(stage)
 
-        for key, value in list(values.items()):
-            if key.endswith("_stage"):
+            elif key.endswith("_stage"):
                 remove_keys.append(key)
-                value["group"] = key.rsplit("_stage", 1)[0]
-                stages.append(value)
+                value["group"] = key.removesuffix("_stage")
+                suffixed_stages.append(value)
+
+        stages.extend(suffixed_stages)
 
         for key in remove_keys:
             del values[key]
@@ -396,6 +420,7 @@ class Recipe(RecipeBase):
         ret = yaml.dump(
             yaml_dict,
             stream=file_stream,
+            Dumper=Dumper,
             allow_unicode=True,
             sort_keys=False,
             default_flow_style=None,
@@ -416,18 +441,23 @@ class Recipe(RecipeBase):
         :return: A dictionary representation of the recipe for yaml serialization
         """
 
-        original_recipe_dict = self.dict()
+        # dump only the recipe level attributes, stages are serialized directly
+        recipe_level_dict = self.model_dump(include={"version", "args"})
         yaml_recipe_dict = {}
 
         # populate recipe level attributes
         recipe_level_attributes = ["version", "args"]
 
         for attribute in recipe_level_attributes:
-            if attribute_value := original_recipe_dict.get(attribute):
+            if attribute_value := recipe_level_dict.get(attribute):
                 yaml_recipe_dict[attribute] = attribute_value
 
+        # group stages by name, matching the stage names of the dict method
+        stages: Dict[str, List[RecipeStage]] = {}
+        for stage in self.stages:
+            stages.setdefault(f"{stage.group}_stage", []).append(stage)
+
         # populate stages
-        stages = original_recipe_dict["stages"]
         for stage_name, stage_list in stages.items():
             for idx, stage in enumerate(stage_list):
                 if len(stage_list) > 1:
@@ -437,11 +467,11 @@ class Recipe(RecipeBase):
                 else:
                     final_stage_name = stage_name
                 stage_dict = get_yaml_serializable_stage_dict(
-                    modifiers=stage["modifiers"]
+                    modifiers=stage.model_dump(include={"modifiers"})["modifiers"]
                 )
 
                 # infer run_type from stage
-                if run_type := stage.get("run_type"):
+                if run_type := getattr(stage, "run_type", None):
                     stage_dict["run_type"] = run_type
 
                 yaml_recipe_dict[final_stage_name] = stage_dict
@@ -454,14 +484,58 @@ RecipeStageInput = Union[str, List[str], List[List[str]]]
 RecipeArgsInput = Union[Dict[str, Any], List[Dict[str, Any]]]
 
 
+def _is_recipe_string(path_or_recipe: str) -> bool:
+    """
+    Cheaply check whether a string is a recipe rather than a file path, so that
+    the filesystem does not need to be checked. Recipe file paths do not contain
+    newlines in practice and are limited to 4096 characters (PATH_MAX on linux)
+
+    :param path_or_recipe: file path or recipe string
+    :return: True if the string is certainly not a file path
+    """
+    return len(path_or_recipe) > 4096 or "\n" in path_or_recipe[:200]
+
+
+@lru_cache(maxsize=32)
+def _load_recipe_from_string(content: str) -> Recipe:
+    """
+    Parse and validate a recipe from a json or yaml string. Results are cached
+    since the same recipe string is often loaded multiple times, callers must copy
+    the returned recipe before modifying it
+
+    :param content: json or yaml recipe string
+    :return: the validated Recipe instance
+    """
+    return Recipe.model_validate(_load_json_or_yaml_string(content))
+
+
+def _json_loads(content: str) -> Any:
+    """
+    Load a json string with orjson when it is installed. Content which orjson
+    rejects but the standard library accepts, such as NaN, Infinity, and integers
+    wider than 64 bits, falls back to the standard library parser so that results
+    do not depend on whether orjson is installed
+
+    :param content: json string to load
+    :return: the loaded json object
+    """
+    if _orjson_loads is not None:
+        try:
+            return _orjson_loads(content)
+        except json.JSONDecodeError:
+            pass
+
+    return json.loads(content)
+
+
 def _load_json_or_yaml_string(content: str) -> Dict[str, Any]:
     # try loading as json first, then yaml
     # if both fail, raise a ValueError
     try:
-        ret = json.loads(content)
+        ret = _json_loads(content)
     except json.JSONDecodeError:
         try:
-            ret = yaml.safe_load(content)
+            ret = yaml.load(content, Loader=SafeLoader)
         except yaml.YAMLError as err:
             raise ValueError(f"Could not parse recipe from string {content}") from err
 
@@ -473,6 +547,24 @@ def _load_json_or_yaml_string(content: str) -> Dict[str, Any]:
     return ret
 
 
+def _build_recipe_modifier(modifier: Modifier, group_name: str) -> RecipeModifier:
+    """
+    Validate a modifier instance and convert it into a RecipeModifier
+
+    :param modifier: the Modifier instance to convert
+    :param group_name: the group to assign the RecipeModifier to
+    :return: the RecipeModifier holding the explicitly set args of the modifier
+    """
+    if not isinstance(modifier, Modifier):
+        raise ValueError("modifiers must be a list of Modifier instances")
+
+    return RecipeModifier(
+        type=modifier.__class__.__name__,
+        group=group_name,
+        args=modifier.model_dump(exclude_unset=True),
+    )
+
+
 def _parse_recipe_from_md(file_path, yaml_str):
     """
     extract YAML front matter from markdown recipe card. Copied from
@@ -481,14 +573,7 @@ def _parse_recipe_from_md(file_path, yaml_str):
     :param yaml_str: string read from file_path
     :return: parsed yaml_str with README info removed
     """
-    # extract YAML front matter from markdown recipe card
-    # adapted from
-    # https://github.com/jonbeebe/frontmatter/blob/master/frontmatter
-    yaml_delim = r"(?:---|\+\+\+)"
-    yaml = r"(.*?)"
-    re_pattern = r"^\s*" + yaml_delim + yaml + yaml_delim
-    regex = re.compile(re_pattern, re.S | re.M)
-    result = regex.search(yaml_str)
+    result = _FRONT_MATTER_RE.search(yaml_str)
 
     if result:
         yaml_str = result.group(1)
@@ -20,6 +20,30 @@ from compressed_tensors.quantization.quant_args import QuantizationArgs
 from llmcompressor.observers import Observer
 
 
+@pytest.fixture(scope="session")
+def inductor_cache_dir(tmp_path_factory):
+    # keep compiled kernels out of the shared temp directory. The precompiled
+    # header dir is resolved when inductor is imported, so it is patched directly
+    from torch._inductor import codecache
+
+    cache_dir = tmp_path_factory.mktemp("inductor")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", str(cache_dir))
+        monkeypatch.setattr(
+            codecache,
+            "_HEADER_DIR",
+            str(cache_dir / "precompiled_headers"),
+            raising=False,
+        )
+        monkeypatch.setattr(
+            codecache,
+            "_HEADER_LOCK_DIR",
+            str(cache_dir / "precompiled_headers" / "locks"),
+            raising=False,
+        )
+        yield cache_dir
+
+
 def make_dummy_g_idx(columns: int, group_size: int) -> torch.Tensor:
     perm = torch.randperm(columns)
     return torch.tensor([index // group_size for index in range(columns)])[perm]
@@ -89,8 +113,8 @@ def test_min_max_observer_value_update():
     curr_min = 1
     for i, tensor in enumerate(tensors):
         observer(tensor)
-        curr_max = max(observer.max_val.get("default"), curr_max)
-        curr_min = min(observer.min_val.get("default"), curr_max)
+        curr_max = max(observer.running_max[0].item(), curr_max)
+        curr_min = min(observer.running_min[0].item(), curr_max)
 
         if i < 2:
             assert curr_max == 1
@@ -119,3 +143,371 @@ def test_g_idx():
 
     assert scale_g_idx == pytest.approx(scale)
     assert zero_point_g_idx == pytest.approx(zero_point)
+
+
+@pytest.mark.parametrize(
+    "shape,reduce_dims",
+    [
+        ((4, 8), None),
+        ((4, 8), (1,)),
+        ((4, 8), (0,)),
+        ((2, 4, 8), (2,)),
+        ((2, 4, 8), (1, 2)),
+        ((2, 4, 8), (0, 2)),
+        ((2, 4, 8), (0, 1)),
+        ((2, 4, 8, 3), (0, 1, 3)),
+        ((2, 4, 8, 3), (2, 3)),
+        ((2, 4, 8, 3), (0, 2)),
+        ((2, 4, 8), (0, 1, 2)),
+    ],
+)
+@pytest.mark.parametrize(
+    "device",
+    [
+        "cpu",
+        pytest.param(
+            "cuda",
+            marks=pytest.mark.skipif(
+                not torch.cuda.is_available(), reason="test requires GPU"
+            ),
+        ),
+    ],
+)
+def test_aminmax_matches_amin_amax(shape, reduce_dims, device):
+    from llmcompressor.observers.min_max import _aminmax
+
+    tensor = torch.randn(shape, device=device)
+    min_val, max_val = _aminmax(tensor, reduce_dims)
+
+    if reduce_dims is None:
+        assert torch.equal(min_val, torch.amin(tensor))
+        assert torch.equal(max_val, torch.amax(tensor))
+    else:
+        assert torch.equal(min_val, torch.amin(tensor, dim=reduce_dims, keepdim=True))
+        assert torch.equal(max_val, torch.amax(tensor, dim=reduce_dims, keepdim=True))
+
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_compiled_minmax_update_matches_eager(symmetric, inductor_cache_dir):
+    from llmcompressor.observers.min_max import (
+        _get_compiled_minmax_update_and_qparams,
+        _minmax_update_and_qparams,
+        _resolve_qparams,
+    )
+
+    quantization_args = QuantizationArgs(num_bits=8, symmetric=symmetric)
+    constants = _resolve_qparams(quantization_args)
+    values = [torch.randn(8, 1) for _ in range(4)]
+
+    # running values are updated in place
+    eager_values = [value.clone() for value in values]
+    expected = _minmax_update_and_qparams(*eager_values, 0.01, *constants)
+    compiled_fn = _get_compiled_minmax_update_and_qparams()
+    actual = compiled_fn(*values, 0.01, *constants)
+
+    for expected_tensor, actual_tensor in zip(expected, actual):
+        assert torch.allclose(expected_tensor.float(), actual_tensor.float())
+
+
+def _raise_unsupported(*args):
+    from torch._dynamo.exc import Unsupported
+
+    raise Unsupported("unsupported op")
+
+
+def _raise_runtime_error():
+    raise RuntimeError("compilation unavailable")
+
+
+@pytest.mark.parametrize(
+    "get_compiled_fn",
+    [_raise_runtime_error, lambda: _raise_unsupported],
+)
+def test_call_compiled_falls_back_to_eager(monkeypatch, get_compiled_fn):
+    from llmcompressor.observers import min_max
+
+    monkeypatch.setattr(min_max, "_COMPILE_OBSERVERS", True)
+    assert min_max._compile_enabled(torch.device("cuda"))
+    assert not min_max._compile_enabled(torch.device("cpu"))
+
+    constants = min_max._resolve_qparams(QuantizationArgs(num_bits=8))
+    values = [torch.randn(8, 1) for _ in range(4)]
+    eager_values = [value.clone() for value in values]
+
+    expected = min_max._minmax_update_and_qparams(*eager_values, 0.01, *constants)
+    actual = min_max._call_compiled(
+        get_compiled_fn, min_max._minmax_update_and_qparams, *values, 0.01, *constants
+    )
+
+    for expected_tensor, actual_tensor in zip(expected, actual):
+        assert torch.equal(expected_tensor, actual_tensor)
+    # the running values are not modified
+    for value, eager_value in zip(values, eager_values):
+        assert torch.equal(value, eager_value)
+    assert not min_max._compile_enabled(torch.device("cuda"))
+
+
+def test_call_compiled_raises_runtime_errors(monkeypatch):
+    from llmcompressor.observers import min_max
+
+    monkeypatch.setattr(min_max, "_COMPILE_OBSERVERS", True)
+
+    def compiled_fn():
+        raise NotImplementedError("unsupported quantization")
+
+    eager_fn = pytest.fail
+    with pytest.raises(NotImplementedError):
+        min_max._call_compiled(lambda: compiled_fn, eager_fn)
+    assert min_max._compile_enabled(torch.device("cuda"))
+
+
+@pytest.mark.parametrize("reduce_dims", [None, (1,), (0, 2)])
+def test_compiled_observer_step_matches_eager(reduce_dims, inductor_cache_dir):
+    from llmcompressor.observers.min_max import (
+        _aminmax,
+        _get_compiled_observer_step,
+        _observer_step,
+        _resolve_qparams,
+    )
+
+    constants = _resolve_qparams(QuantizationArgs(num_bits=8, symmetric=False))
+    observed = torch.randn(4, 8, 16)
+    running_min, running_max = _aminmax(observed * 2, reduce_dims)
+
+    eager_values = (running_min.clone(), running_max.clone())
+    expected = _observer_step(observed, reduce_dims, *eager_values, 0.01, *constants)
+    actual = _get_compiled_observer_step()(
+        observed, reduce_dims, running_min, running_max, 0.01, *constants
+    )
+
+    for expected_tensor, actual_tensor in zip(expected, actual):
+        assert torch.allclose(expected_tensor.float(), actual_tensor.float())
+
+
+def test_min_max_observer_stable_steps():
+    from llmcompressor.observers.min_max import _STABLE_STEPS_BEFORE_COMPILE
+
+    weights = QuantizationArgs(num_bits=8, observer="minmax")
+    observer = Observer.load_from_registry("minmax", quantization_args=weights)
+    tensor = torch.randn(8, 16)
+
+    for _ in range(_STABLE_STEPS_BEFORE_COMPILE - 1):
+        assert not observer._is_stable_step(tensor, (1,))
+
+    # a change in shape restarts the count
+    assert not observer._is_stable_step(torch.randn(4, 16), (1,))
+    for _ in range(_STABLE_STEPS_BEFORE_COMPILE - 1):
+        assert not observer._is_stable_step(tensor, (1,))
+
+    assert observer._is_stable_step(tensor, (1,))
+    assert not observer._is_stable_step(torch.randn(4, 16), (1,))
+    assert observer._is_stable_step(tensor, (1,))
+
+
+def test_min_max_observer_compiled_steps_many_shapes(monkeypatch, inductor_cache_dir):
+    from llmcompressor.observers import min_max
+
+    weights = QuantizationArgs(num_bits=8, strategy="channel", observer="minmax")
+    num_steps = min_max._STABLE_STEPS_BEFORE_COMPILE + 2
+
+    # one observer per weight shape, with more distinct shapes than dynamo's
+    # default recompile limit
+    shapes = [(rows, 16 * (rows + 1)) for rows in range(2, 14)]
+    tensors = [
+        [torch.randn(shape) * (step + 1) for step in range(num_steps)]
+        for shape in shapes
+    ]
+
+    def calibrate(compiled):
+        qparams = []
+        for shape_tensors in tensors:
+            observer = Observer.load_from_registry("minmax", quantization_args=weights)
+            qparams.extend(observer(tensor) for tensor in shape_tensors)
+            assert len(observer._stable_step_keys) == int(compiled)
+        return qparams
+
+    # exercise the compiled path on cpu
+    monkeypatch.setattr(min_max, "_COMPILE_OBSERVERS", True)
+    monkeypatch.setattr(min_max, "_compile_enabled", lambda device: True)
+    qparams = calibrate(compiled=True)
+
+    # compilation did not fail and fall back to eager
+    assert min_max._COMPILE_OBSERVERS
+
+    monkeypatch.undo()
+    expected_qparams = calibrate(compiled=False)
+
+    for (scale, zero_point), (expected_scale, expected_zero_point) in zip(
+        qparams, expected_qparams
+    ):
+        assert torch.allclose(scale, expected_scale)
+        assert torch.equal(zero_point, expected_zero_point)
+
+
+def test_min_max_observer_running_buffers():
+    group_size = 4
+    tensor = torch.rand(8, 16)
+    weights = QuantizationArgs(num_bits=8, group_size=group_size, observer="minmax")
+    observer = Observer.load_from_registry("minmax", quantization_args=weights)
+
+    observer(tensor)
+    assert observer.running_min.shape == (4, 8, 1)
+    assert observer.running_max.shape == (4, 8, 1)
+    assert dict(observer.named_buffers()).keys() == {"running_min", "running_max"}
+    assert observer.state_dict() == {}
+
+    # reset reuses the existing rows rather than growing the buffers
+    observer.reset()
+    observer(tensor * 2)
+    assert observer.running_max.shape == (4, 8, 1)
+    assert torch.equal(observer.running_max[1], torch.amax(tensor[:, 4:8] * 2, 1, True))
+
+
+def test_min_max_observer_token_strategy():
+    tokens = QuantizationArgs(num_bits=8, strategy="token", observer="minmax")
+    observer = Observer.load_from_registry("minmax", quantization_args=tokens)
+
+    tensor = torch.randn(2, 5, 16)
+    scale, zero_point = observer(tensor)
+    assert scale.shape == (1, 1, 1)
+    assert zero_point.shape == (1, 1, 1)
+    assert torch.allclose(scale, tensor.abs().amax() * 2 / 255)
+
+    # inputs with a different number of tokens update the same running values
+    scale, _ = observer(torch.randn(2, 7, 16))
+    assert scale.shape == (1, 1, 1)
+
+
+def test_min_max_observer_qparams_cache():
+    tensor = torch.rand(8, 16)
+    weights = QuantizationArgs(num_bits=8, strategy="channel", observer="minmax")
+    observer = Observer.load_from_registry(
+        "minmax", quantization_args=weights, averaging_constant=1.0
+    )
+
+    scale, zero_point = observer(tensor)
+    cached_scale, cached_zero_point = observer(tensor)
+    assert cached_scale is scale
+    assert cached_zero_point is zero_point
+
+    updated_scale, _ = observer(tensor * 2)
+    assert updated_scale is not scale
+    assert torch.all(updated_scale > scale)
+
+    observer.reset()
+    assert observer(tensor)[0] is not scale
+
+
+def test_min_max_observer_qparams_cache_unused_with_averaging():
+    tensor = torch.rand(8, 16)
+    weights = QuantizationArgs(num_bits=8, strategy="channel", observer="minmax")
+    observer = Observer.load_from_registry("minmax", quantization_args=weights)
+
+    scale, _ = observer(tensor)
+    assert torch.equal(observer(tensor)[0], scale)
+    assert observer._qparams_cache == {}
+
+
+@pytest.mark.parametrize("dim", [0, -2])
+def test_min_max_observer_calibrate_batch(dim):
+    from llmcompressor.observers.min_max import MinMaxObserver
+
+    weights = QuantizationArgs(num_bits=8, strategy="channel", observer="minmax")
+    tensors = [torch.randn(8, 16) for _ in range(3)]
+    observers = [MinMaxObserver(quantization_args=weights) for _ in tensors]
+    expected_observers = [MinMaxObserver(quantization_args=weights) for _ in tensors]
+
+    qparams = MinMaxObserver.calibrate_batch(observers, tensors, dim=dim)
+
+    assert len(qparams) == len(tensors)
+    for tensor, observer, expected_observer, (scale, zero_point) in zip(
+        tensors, observers, expected_observers, qparams
+    ):
+        expected_scale, expected_zero_point = expected_observer(tensor)
+        assert torch.equal(scale, expected_scale)
+        assert torch.equal(zero_point, expected_zero_point)
+        assert torch.equal(observer.running_min, expected_observer.running_min)
+        assert torch.equal(observer.running_max, expected_observer.running_max)
+
+        # bookkeeping matches calling the observer
+        assert observer.get_qparams()[0] is scale
+        assert observer.get_qparams()[1] is zero_point
+        assert observer._num_observed_tokens == expected_observer._num_observed_tokens
+
+
+def test_min_max_observer_calibrate_batch_invalid_args():
+    from llmcompressor.observers.min_max import MinMaxObserver
+
+    weights = QuantizationArgs(num_bits=8, strategy="channel", observer="minmax")
+    observer = MinMaxObserver(quantization_args=weights)
+
+    with pytest.raises(ValueError):
+        MinMaxObserver.calibrate_batch([], [], dim=0)
+    with pytest.raises(ValueError):
+        MinMaxObserver.calibrate_batch([observer], [torch.randn(8, 16)], dim=2)
+
+
+def test_min_max_observer_no_grad():
+    tensor = torch.rand(8, 16, requires_grad=True)
+    weights = QuantizationArgs(num_bits=8, strategy="channel", observer="minmax")
+    observer = Observer.load_from_registry("minmax", quantization_args=weights)
+
+    scale, zero_point = observer.calculate_qparams(tensor, reduce_dims=(1,))
+    assert not scale.requires_grad
+    assert not scale.is_inference()
+    assert not observer.running_min.is_inference()
+
+    # returned qparams can be used in autograd and updated in place
+    (tensor * scale).sum().backward()
+    scale.mul_(2)
+
+    # running state can be reset and updated
+    observer.reset()
+    observer(tensor)
+    observer(tensor * 2)
+
+
+@pytest.mark.parametrize(
+    "quantization_args,global_scale",
+    [
+        (QuantizationArgs(num_bits=8, symmetric=True), None),
+        (QuantizationArgs(num_bits=8, symmetric=False), None),
+        (QuantizationArgs(num_bits=4, symmetric=False, strategy="channel"), None),
+        (QuantizationArgs(num_bits=8, type="float", symmetric=True), None),
+        (
+            QuantizationArgs(
+                num_bits=4,
+                type="float",
+                symmetric=True,
+                strategy="tensor_group",
+                group_size=16,
+            ),
+            torch.tensor([2.5]),
+        ),
+    ],
+)
+def test_calculate_qparams_fast_matches_calculate_qparams(
+    quantization_args, global_scale
+):
+    from compressed_tensors.quantization.utils import calculate_qparams
+
+    from llmcompressor.observers.min_max import (
+        _calculate_qparams_fast,
+        _resolve_qparams,
+    )
+
+    min_vals = torch.randn(8, 1)
+    max_vals = torch.randn(8, 1)
+    min_vals[0] = max_vals[0] = 0.0
+
+    expected_scale, expected_zero_point = calculate_qparams(
+        min_vals, max_vals, quantization_args, global_scale=global_scale
+    )
+    scale, zero_point = _calculate_qparams_fast(
+        min_vals, max_vals, *_resolve_qparams(quantization_args), global_scale
+    )
+
+    assert scale.dtype == expected_scale.dtype
+    assert zero_point.dtype == expected_zero_point.dtype
+    assert torch.equal(scale.float(), expected_scale.float())
+    assert torch.equal(zero_point.float(), expected_zero_point.float())
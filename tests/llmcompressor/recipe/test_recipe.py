@@ -1,9 +1,23 @@
+import math
 import tempfile
+from typing import Annotated, List, Optional
 
 import pytest
 import yaml
-
+from compressed_tensors.quantization import QuantizationArgs, QuantizationScheme
+from packaging import version
+from pydantic import (
+    VERSION,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    WrapSerializer,
+    computed_field,
+)
+
+from llmcompressor.modifiers import Modifier
 from llmcompressor.modifiers.obcq.base import SparseGPTModifier
+from llmcompressor.modifiers.quantization import GPTQModifier, QuantizationModifier
 from llmcompressor.recipe import Recipe
 from tests.llmcompressor.helpers import valid_recipe_strings
 
@@ -96,3 +110,115 @@ def test_recipe_can_be_created_from_modifier_instances():
     ):
         assert isinstance(actual_modifier, type(expected_modifier))
         assert actual_modifier.model_dump() == expected_modifier.model_dump()
+
+
+class ComputedFieldModifier(Modifier):
+    sparsity: float = 0.5
+
+    @computed_field
+    @property
+    def density(self) -> float:
+        return 1 - self.sparsity
+
+    def on_initialize(self, state, **kwargs) -> bool:
+        return True
+
+
+class PlainSerializerModifier(Modifier):
+    layers: Annotated[List[str], PlainSerializer(lambda value: ",".join(value))] = []
+
+    def on_initialize(self, state, **kwargs) -> bool:
+        return True
+
+
+class NestedWrapSerializerModifier(Modifier):
+    scale: Optional[
+        Annotated[float, WrapSerializer(lambda value, handler: str(handler(value)))]
+    ] = None
+
+    def on_initialize(self, state, **kwargs) -> bool:
+        return True
+
+
+@pytest.mark.skipif(
+    version.parse(VERSION) < version.parse("2.11"),
+    reason="exclude_if and serialize_by_alias require pydantic>=2.11",
+)
+def test_recipe_from_modifiers_applies_serialization_config():
+    class ExcludeIfModifier(Modifier):
+        threshold: Optional[float] = Field(default=None, exclude_if=lambda v: v is None)
+
+        def on_initialize(self, state, **kwargs) -> bool:
+            return True
+
+    class SerializeByAliasModifier(Modifier):
+        model_config = ConfigDict(serialize_by_alias=True)
+
+        foo: int = Field(default=1, serialization_alias="bar")
+
+        def on_initialize(self, state, **kwargs) -> bool:
+            return True
+
+    exclude_if_recipe = Recipe.from_modifiers(ExcludeIfModifier(threshold=None))
+    assert exclude_if_recipe.stages[0].modifiers[0].args == {}
+
+    alias_recipe = Recipe.from_modifiers(SerializeByAliasModifier(foo=2))
+    assert alias_recipe.stages[0].modifiers[0].args == {"bar": 2}
+
+
+@pytest.mark.parametrize(
+    "modifier",
+    [
+        SparseGPTModifier(sparsity=0.5, targets=["re:.*"], ignore=["lm_head"]),
+        ComputedFieldModifier(sparsity=0.25),
+        PlainSerializerModifier(layers=["q_proj", "k_proj"]),
+        NestedWrapSerializerModifier(scale=0.5),
+        GPTQModifier(targets="Linear", scheme="W4A16", ignore=["lm_head"]),
+        QuantizationModifier(
+            config_groups={
+                "group_0": QuantizationScheme(
+                    targets=["Linear"],
+                    weights=QuantizationArgs(num_bits=4, strategy="channel"),
+                )
+            }
+        ),
+    ],
+)
+def test_recipe_from_modifiers_dumps_set_args(modifier):
+    recipe = Recipe.from_modifiers(modifier)
+    recipe_modifier = recipe.stages[0].modifiers[0]
+
+    assert recipe_modifier.args == modifier.model_dump(exclude_unset=True)
+
+
+@pytest.mark.parametrize("recipe_str", valid_recipe_strings())
+def test_recipe_create_instance_from_string_returns_copies(recipe_str):
+    recipe = Recipe.create_instance(recipe_str)
+    expected_dict = recipe.dict()
+    recipe.stages[0].modifiers.clear()
+    recipe.args["modified"] = True
+
+    recipe_copy = Recipe.create_instance(recipe_str)
+
+    assert recipe_copy is not recipe
+    assert recipe_copy.dict() == expected_dict
+
+
+@pytest.mark.parametrize("from_file", [False, True])
+def test_recipe_create_instance_parses_non_finite_json(from_file):
+    recipe_str = (
+        '{"test_stage": {"pruning_modifiers": {"ConstantPruningModifier": '
+        '{"start": NaN, "end": 10, "targets": "__ALL_PRUNABLE__"}}}}'
+    )
+
+    if from_file:
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json") as f:
+            f.write(recipe_str)
+            f.flush()
+            recipe = Recipe.create_instance(f.name)
+    else:
+        recipe = Recipe.create_instance(recipe_str)
+
+    args = recipe.stages[0].modifiers[0].args
+    assert math.isnan(args["start"])
+    assert args["end"] == 10